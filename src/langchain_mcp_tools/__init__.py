@@ -3,3 +3,8 @@ from .langchain_mcp_tools import (
   convert_mcp_to_langchain_tools,
   McpServerCleanupFn,
 )
+
+__all__ = [
+  'convert_mcp_to_langchain_tools',
+  'McpServerCleanupFn',
+]
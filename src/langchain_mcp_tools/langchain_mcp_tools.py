@@ -3,10 +3,15 @@ from anyio.streams.memory import (
     MemoryObjectReceiveStream,
     MemoryObjectSendStream,
 )
+import asyncio
+import functools
+import hashlib
+import itertools
 import logging
 import os
 import sys
-from contextlib import AsyncExitStack, asynccontextmanager
+import time
+from contextlib import AsyncExitStack
 from typing import (
     Any,
     Awaitable,
@@ -26,8 +31,8 @@ try:
     from mcp import ClientSession, StdioServerParameters
     from mcp.client.stdio import stdio_client
     import mcp.types as mcp_types
-    from pydantic import BaseModel
-    from pympler import asizeof
+    import orjson
+    from pydantic import BaseModel, PrivateAttr
 except ImportError as e:
     print(f'\nError: Required package not found: {e}')
     print('Please ensure all required packages are installed\n')
@@ -41,6 +46,30 @@ StdioTransport: TypeAlias = tuple[
     MemoryObjectSendStream[mcp_types.JSONRPCMessage]
 ]
 
+# Default environment merged into the `env` of each server config,
+# computed once at import time
+_BASE_ENV: Dict[str, str] = {'PATH': os.environ.get('PATH', '')}
+
+# Default timeout (in seconds) of each of the initialization and the tools
+# listing, to avoid hanging forever on a broken server.
+# NOTE: initialization includes the server's own startup, which can take
+# a while, e.g. when `npx -y` downloads the package on first use
+_DEFAULT_TIMEOUT = 60.0
+
+
+class _JsonLogArg:
+    """
+    Log message argument that is serialized to JSON by orjson only when
+    the message actually gets formatted, i.e. not below the log level.
+    """
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def __str__(self) -> str:
+        return orjson.dumps(self.value, default=repr).decode()
+
 
 async def spawn_mcp_server_and_get_transport(
     server_name: str,
@@ -64,15 +93,13 @@ async def spawn_mcp_server_and_get_transport(
         Exception: If server spawning fails
     """
     try:
-        logger.info(f'MCP server "{server_name}": '
-                    f'initializing with: {server_config}')
+        logger.info('MCP server "%s": initializing with: %s',
+                    server_name, _JsonLogArg(server_config))
 
         # NOTE: `uv` and `npx` seem to require PATH to be set.
         # To avoid confusion, it was decided to automatically append it
         # to the env if not explicitly set by the config.
-        env = dict(server_config.get('env', {}))
-        if 'PATH' not in env:
-            env['PATH'] = os.environ.get('PATH', '')
+        env = {**_BASE_ENV, **(server_config.get('env') or {})}
 
         # Create server parameters with command, arguments and environment
         server_params = StdioServerParameters(
@@ -82,124 +109,467 @@ async def spawn_mcp_server_and_get_transport(
         )
 
         # Initialize stdio client and register it with exit stack for cleanup
+        # NOTE: the process is started via `anyio.open_process()`, which is
+        # already async; only the fork/exec itself runs on the event loop
+        # thread, while the server's own startup (e.g. Node.js module
+        # loading for `npx`) runs in the child process concurrently with the
+        # other spawns. Offloading further into a thread would require
+        # replacing the `stdio_client()` transport, so it's not done here.
         stdio_transport = await exit_stack.enter_async_context(
             stdio_client(server_params)
         )
     except Exception as e:
-        logger.error(f'Error spawning MCP server: {str(e)}')
+        logger.error('Error spawning MCP server: %s', e)
         raise
 
     return stdio_transport
 
 
-async def get_mcp_server_tools(
+@functools.lru_cache(maxsize=512)
+def _compile_schema(schema_json: str) -> Type[BaseModel]:
+    """
+    Converts a canonicalized JSON schema into a Pydantic model.
+
+    Building a model class is expensive, so the result is memoized and
+    shared among the tools (and servers) that declare identical schemas.
+    Use `_canonicalize_schema()` to get the cache key from a schema dict.
+    """
+    return jsonschema_to_pydantic(orjson.loads(schema_json))
+
+
+def _canonicalize_schema(schema: Dict[str, Any]) -> str:
+    """Serializes a JSON schema dict into a stable, hashable string"""
+    return orjson.dumps(schema, option=orjson.OPT_SORT_KEYS).decode()
+
+
+class McpToLangChainAdapter(BaseTool):
+    """
+    LangChain tool that calls an MCP tool through a client session.
+
+    A single class serves all MCP tools; the per-tool name, description and
+    argument schema are regular fields, and the connection state is kept in
+    private attributes.
+    """
+    _session: ClientSession = PrivateAttr()
+    _server_name: str = PrivateAttr()
+    _logger: logging.Logger = PrivateAttr()
+    _input_schema: Dict[str, Any] | None = PrivateAttr(default=None)
+
+    def __init__(
+        self,
+        *,
+        session: ClientSession,
+        server_name: str,
+        logger: logging.Logger,
+        input_schema: Dict[str, Any] | None = None,
+        **kwargs: Any
+    ) -> None:
+        """
+        Args:
+            session: Client session connected to the tool's server
+            server_name: Server instance name to use for better logging
+            logger: Logger instance for debugging and monitoring
+            input_schema: JSON schema to compile into `args_schema` on its
+                first access, instead of passing `args_schema` up front
+            **kwargs: `BaseTool` fields, i.e. `name`, `description`
+                and `args_schema`
+        """
+        super().__init__(**kwargs)
+        self._session = session
+        self._server_name = server_name
+        self._logger = logger
+        if input_schema is not None:
+            # Leave the field out of the instance `__dict__` so that
+            # `__getattr__()` gets called, but report it as explicitly set
+            # like the `args_schema` passed to an eager tool
+            self._input_schema = input_schema
+            del self.__dict__['args_schema']
+            self.__pydantic_fields_set__.add('args_schema')
+
+    def _ensure_args_schema(self) -> None:
+        """Materializes a deferred `args_schema`, unless already done"""
+        if 'args_schema' not in self.__dict__:
+            assert self._input_schema is not None
+            self.args_schema = _compile_schema(
+                _canonicalize_schema(self._input_schema)
+            )
+
+    def __getattr__(self, item: str) -> Any:
+        if item == 'args_schema' and self._input_schema is not None:
+            self._ensure_args_schema()
+            return self.__dict__['args_schema']
+        return super().__getattr__(item)
+
+    # NOTE: the following read the fields directly from the instance
+    # `__dict__`, so materialize a deferred `args_schema` first to make
+    # their output independent of whether it has been accessed yet
+
+    def __iter__(self) -> Any:
+        self._ensure_args_schema()
+        return super().__iter__()
+
+    def __eq__(self, other: Any) -> bool:
+        self._ensure_args_schema()
+        if isinstance(other, McpToLangChainAdapter):
+            other._ensure_args_schema()
+        return super().__eq__(other)
+
+    def __repr_args__(self) -> Any:
+        self._ensure_args_schema()
+        return super().__repr_args__()
+
+    def model_dump(self, **kwargs: Any) -> Dict[str, Any]:
+        self._ensure_args_schema()
+        return super().model_dump(**kwargs)
+
+    def model_dump_json(self, **kwargs: Any) -> str:
+        self._ensure_args_schema()
+        return super().model_dump_json(**kwargs)
+
+    def _run(self, **kwargs: Any) -> NoReturn:
+        raise NotImplementedError(
+            'Only async operation is supported'
+        )
+
+    async def _arun(self, **kwargs: Any) -> Any:
+        """
+        Asynchronously executes the tool with given arguments.
+        Logs input/output and handles errors.
+        """
+        server_name = self._server_name
+        logger = self._logger
+        logger.info('MCP tool "%s"/"%s" received input: %s',
+                    server_name, self.name, _JsonLogArg(kwargs))
+        start_ns = time.perf_counter_ns()
+        result = await self._session.call_tool(self.name, kwargs)
+        elapsed_us = (time.perf_counter_ns() - start_ns) // 1000
+        # Branch on the content type once instead of catching exceptions;
+        # only text results are supported, other content parts are skipped
+        content = result.content
+        if isinstance(content, str):
+            result_content_text = content
+        elif isinstance(content, list) and (
+            not content or any(hasattr(x, 'text') for x in content)
+        ):
+            result_content_text = "".join(
+                [x.text for x in content if hasattr(x, 'text')]
+            )
+        else:
+            # E.g. only images; report them rather than an empty result
+            result_content_text = (
+                f"Result content text parsing error: {repr(content)}"
+            )
+        if result.isError:
+            raise ToolException(result_content_text)
+
+        # Log result length and call latency for monitoring
+        size = len(result_content_text)
+        logger.info('MCP tool "%s"/"%s" received result '
+                    '(length: %d, latency: %d us)',
+                    server_name, self.name, size, elapsed_us)
+
+        return result_content_text
+
+
+async def start_mcp_session(
     server_name: str,
     stdio_transport: StdioTransport,
     exit_stack: AsyncExitStack,
-    logger: logging.Logger = logging.getLogger(__name__)
-) -> List[BaseTool]:
+    logger: logging.Logger = logging.getLogger(__name__),
+    timeout: float | None = _DEFAULT_TIMEOUT
+) -> ClientSession:
     """
-    Retrieves and converts MCP server tools to LangChain format.
+    Opens and initializes an MCP client session over the given transport.
 
     Args:
         server_name: Server instance name to use for better logging
         stdio_transport: Communication channels tuple
         exit_stack: Context manager for cleanup handling
         logger: Logger instance for debugging and monitoring
+        timeout: Seconds to wait for the initialization, or None to wait
+            indefinitely
 
     Returns:
-        List of LangChain tools converted from MCP tools
+        The initialized client session
 
     Raises:
-        Exception: If tool conversion fails
+        Exception: If session initialization fails
     """
     try:
         read, write = stdio_transport
 
-        # Use an intermediate `asynccontextmanager` to log the cleanup message
-        @asynccontextmanager
-        async def log_before_aexit(context_manager, message):
-            """Helper context manager that logs before cleanup"""
-            yield await context_manager.__aenter__()
-            try:
-                logger.info(message)
-            finally:
-                await context_manager.__aexit__(None, None, None)
-
         # Initialize client session with cleanup logging
         session = await exit_stack.enter_async_context(
-            log_before_aexit(
-                ClientSession(read, write),
-                f'MCP server "{server_name}": session closed'
-            )
+            ClientSession(read, write)
+        )
+        # NOTE: exit callbacks run in LIFO order, i.e. this message is logged
+        # right before the session above gets closed
+        exit_stack.callback(
+            logger.info,
+            'MCP server "%s": session closed',
+            server_name
         )
 
-        await session.initialize()
-        logger.info(f'MCP server "{server_name}": connected')
+        # NOTE: the MCP spec requires the initialization to complete
+        # before any other request, so `list_tools()` can't be pipelined
+        try:
+            await asyncio.wait_for(session.initialize(), timeout)
+        except TimeoutError as e:
+            raise TimeoutError(
+                f'MCP server "{server_name}": initialization timed out '
+                f'after {timeout} seconds'
+            ) from e
+        logger.info('MCP server "%s": connected', server_name)
+    except Exception as e:
+        logger.error('Error initializing MCP session: %s', e)
+        raise
+
+    return session
+
+
+async def get_mcp_server_tools(
+    server_name: str,
+    session: ClientSession,
+    logger: logging.Logger = logging.getLogger(__name__),
+    lazy: bool = False,
+    timeout: float | None = _DEFAULT_TIMEOUT
+) -> List[BaseTool]:
+    """
+    Retrieves and converts MCP server tools to LangChain format.
+
+    Args:
+        server_name: Server instance name to use for better logging
+        session: Initialized client session connected to the server
+        logger: Logger instance for debugging and monitoring
+        lazy: Defer the compilation of each tool's argument schema until
+            the schema is first used
+        timeout: Seconds to wait for the tools listing, or None to wait
+            indefinitely
 
+    Returns:
+        List of LangChain tools converted from MCP tools
+
+    Raises:
+        Exception: If tool conversion fails
+    """
+    try:
         # Get MCP tools
-        tools_response = await session.list_tools()
+        try:
+            tools_response = await asyncio.wait_for(
+                session.list_tools(),
+                timeout
+            )
+        except TimeoutError as e:
+            raise TimeoutError(
+                f'MCP server "{server_name}": listing tools timed out '
+                f'after {timeout} seconds'
+            ) from e
 
         # Wrap MCP tools into LangChain tools
         langchain_tools: List[BaseTool] = []
         for tool in tools_response.tools:
-            # Define adapter class to convert MCP tool to LangChain format
-            class McpToLangChainAdapter(BaseTool):
-                name: str = tool.name or 'NO NAME'
-                description: str = tool.description or ''
-                # Convert JSON schema to Pydantic model for argument validation
-                args_schema: Type[BaseModel] = jsonschema_to_pydantic(
-                    tool.inputSchema
-                )
-
-                def _run(self, **kwargs: Any) -> NoReturn:
-                    raise NotImplementedError(
-                        'Only async operation is supported'
+            if lazy:
+                schema_kwargs: Dict[str, Any] = {
+                    'input_schema': tool.inputSchema
+                }
+            else:
+                schema_kwargs = {
+                    # Convert JSON schema to Pydantic model for argument
+                    # validation
+                    'args_schema': _compile_schema(
+                        _canonicalize_schema(tool.inputSchema)
                     )
-
-                async def _arun(self, **kwargs: Any) -> Any:
-                    """
-                    Asynchronously executes the tool with given arguments.
-                    Logs input/output and handles errors.
-                    """
-                    logger.info(f'MCP tool "{server_name}"/"{tool.name}"'
-                                f' received input: {kwargs}')
-                    result = await session.call_tool(self.name, kwargs)
-                    try:
-                        result_content_text = "".join(x.text for x in result.content)
-                    except (AttributeError, TypeError):
-                        result_content_text = f"Result content text parsing error: {repr(result.content)}"
-                    if result.isError:
-                        raise ToolException(result_content_text)
-
-                    # Log result size for monitoring
-                    size = asizeof.asizeof(result_content_text)
-                    logger.info(f'MCP tool "{server_name}"/"{tool.name}" '
-                                f'received result (size: {size})')
-
-                    return result_content_text
-
-            langchain_tools.append(McpToLangChainAdapter())
+                }
+            langchain_tools.append(McpToLangChainAdapter(
+                name=tool.name or 'NO NAME',
+                description=tool.description or '',
+                session=session,
+                server_name=server_name,
+                logger=logger,
+                **schema_kwargs
+            ))
 
         # Log available tools for debugging
-        logger.info(f'MCP server "{server_name}": {len(langchain_tools)} '
-                    f'tool(s) available:')
-        for tool in langchain_tools:
-            logger.info(f'- {tool.name}')
+        logger.info('MCP server "%s": %d tool(s) available:',
+                    server_name, len(langchain_tools))
+        if logger.isEnabledFor(logging.INFO):
+            for tool in langchain_tools:
+                logger.info('- %s', tool.name)
     except Exception as e:
-        logger.error(f'Error getting MCP tools: {str(e)}')
+        logger.error('Error getting MCP tools: %s', e)
         raise
 
     return langchain_tools
 
 
+class _McpServerEntry:
+    """
+    A running MCP server session, shared among callers by reference counting.
+
+    The server is run by its own task, which owns the `AsyncExitStack`
+    for the whole lifetime of the session; the task closes it once
+    `close_event` gets set by the last `_release_mcp_server()`.
+    """
+
+    def __init__(self, key: str | None) -> None:
+        self.key = key
+        self.loop = asyncio.get_running_loop()
+        self.session: asyncio.Future[ClientSession] = self.loop.create_future()
+        self.refcount = 0
+        self.close_event = asyncio.Event()
+        self.task: asyncio.Task[None] | None = None
+
+
+# Running servers that can be shared, keyed by `_get_server_pool_key()`
+_server_pool: Dict[str, _McpServerEntry] = {}
+
+# Upper limit of the servers spawned and initialized at the same time,
+# to avoid a burst of fork/exec and open file descriptors with many servers
+_MAX_CONCURRENT_SPAWNS = max(8, os.cpu_count() or 4)
+
+
+def _get_server_pool_key(server_config: Dict[str, Any]) -> str | None:
+    """
+    Computes the key identifying servers that can share a single process.
+
+    Returns `None` if the config opts out of sharing with `noShare: true`,
+    e.g. for servers that keep per-client state.
+    """
+    if server_config.get('noShare'):
+        return None
+    return hashlib.blake2b(orjson.dumps([
+        server_config['command'],
+        server_config.get('args', []),
+        sorted((server_config.get('env') or {}).items())
+    ])).hexdigest()
+
+
+def _discard_mcp_server(entry: _McpServerEntry) -> None:
+    """Removes the entry from the pool so that it's no longer shared"""
+    if entry.key is not None and _server_pool.get(entry.key) is entry:
+        del _server_pool[entry.key]
+
+
+async def _run_mcp_server(
+    entry: _McpServerEntry,
+    server_name: str,
+    server_config: Dict[str, Any],
+    spawn_semaphore: asyncio.Semaphore,
+    logger: logging.Logger,
+    timeout: float | None
+) -> None:
+    """Spawns a server and keeps its session open until the entry closes"""
+    # NOTE: `stdio_client()` runs an anyio task group internally, so its
+    # context has to be exited by the same task that entered it.
+    try:
+        async with AsyncExitStack() as exit_stack:
+            try:
+                async with spawn_semaphore:
+                    stdio_transport = (
+                        await spawn_mcp_server_and_get_transport(
+                            server_name,
+                            server_config,
+                            exit_stack,
+                            logger
+                        )
+                    )
+                    session = await start_mcp_session(
+                        server_name,
+                        stdio_transport,
+                        exit_stack,
+                        logger,
+                        timeout
+                    )
+            except asyncio.CancelledError:
+                entry.session.cancel()
+                raise
+            except Exception as e:
+                entry.session.set_exception(e)
+                return
+            entry.session.set_result(session)
+            await entry.close_event.wait()
+    finally:
+        # Stop sharing the server as soon as its task exits for any reason,
+        # e.g. when the transport failed since the process died on its own
+        _discard_mcp_server(entry)
+
+
+def _acquire_mcp_server(
+    server_name: str,
+    server_config: Dict[str, Any],
+    spawn_semaphore: asyncio.Semaphore,
+    logger: logging.Logger,
+    timeout: float | None
+) -> _McpServerEntry:
+    """
+    Returns a running (or starting) server for the config, spawning a new
+    one unless an identical shareable server is already in the pool.
+    New servers are spawned while holding `spawn_semaphore`.
+
+    NOTE: there is no `await` between the pool lookup and the insertion,
+    so concurrent callers can't spawn duplicates and no lock is needed.
+    """
+    key = _get_server_pool_key(server_config)
+    entry = _server_pool.get(key) if key is not None else None
+    if entry is None or entry.loop is not asyncio.get_running_loop():
+        entry = _McpServerEntry(key)
+        if key is not None:
+            _server_pool[key] = entry
+        entry.task = asyncio.create_task(
+            _run_mcp_server(
+                entry,
+                server_name,
+                server_config,
+                spawn_semaphore,
+                logger,
+                timeout
+            )
+        )
+    else:
+        logger.info('MCP server "%s": sharing an already running instance',
+                    server_name)
+    entry.refcount += 1
+    return entry
+
+
+async def _release_mcp_server(entry: _McpServerEntry) -> None:
+    """Drops a reference and shuts the server down with the last one"""
+    entry.refcount -= 1
+    if entry.refcount == 0:
+        _discard_mcp_server(entry)
+        entry.close_event.set()
+        assert entry.task is not None
+        stopping = not entry.session.done()
+        if stopping:
+            # Nobody waits for the server any longer; stop its startup
+            entry.task.cancel()
+        try:
+            # Propagate errors of the server, e.g. on its shutdown
+            await entry.task
+        except asyncio.CancelledError:
+            # Swallow only the cancellation requested above
+            if not (stopping and entry.task.cancelled()):
+                raise
+        finally:
+            if entry.task.done():
+                if not entry.session.done():
+                    # The task got cancelled before it even started
+                    entry.session.cancel()
+                elif not entry.session.cancelled():
+                    # Mark a startup error as retrieved; it was already
+                    # reported to the callers that awaited the session
+                    entry.session.exception()
+
+
 # Type hint for cleanup function
 McpServerCleanupFn = Callable[[], Awaitable[None]]
 
 
 async def convert_mcp_to_langchain_tools(
     server_configs: Dict[str, Dict[str, Any]],
-    logger: logging.Logger = logging.getLogger(__name__)
+    logger: logging.Logger = logging.getLogger(__name__),
+    lazy: bool = False,
+    timeout: float | None = _DEFAULT_TIMEOUT
 ) -> Tuple[List[BaseTool], McpServerCleanupFn]:
     """Initialize multiple MCP servers and convert their tools to
     LangChain format.
@@ -214,6 +584,13 @@ async def convert_mcp_to_langchain_tools(
             and env settings
         logger: Logger instance to use for logging events and errors.
                Defaults to module logger.
+        lazy: If True, the argument schema of each tool is compiled into
+              a Pydantic model only when first used (e.g. when bound to
+              an LLM or invoked), which speeds up the startup when only
+              some of the tools are going to be used. Defaults to False.
+        timeout: Seconds to wait for each server to initialize, and then
+                 to list its tools, before raising `TimeoutError`;
+                 None waits indefinitely. Defaults to 60.
 
     Returns:
         A tuple containing:
@@ -231,48 +608,108 @@ async def convert_mcp_to_langchain_tools(
         await cleanup()
     """
 
-    # Initialize AsyncExitStack for managing multiple server lifecycles
-    stdio_transports: List[StdioTransport] = []
-    async_exit_stack = AsyncExitStack()
-
-    # Spawn all MCP servers concurrently
-    for server_name, server_config in server_configs.items():
-        # NOTE: the following `await` only blocks until the server subprocess
-        # is spawned, i.e. after returning from the `await`, the spawned
-        # subprocess starts its initialization independently of (so in
-        # parallel with) the Python execution of the following lines.
-        stdio_transport = await spawn_mcp_server_and_get_transport(
+    # Take a snapshot of the configs, which is iterated more than once, and
+    # only later by the supervisor task, so mutations by the caller during
+    # the initialization can't affect it
+    server_items = tuple(server_configs.items())
+
+    # NOTE: each server process is owned by a task of its own (see
+    # `_run_mcp_server()`), since identical servers can be shared with
+    # other callers by reference counting. Acquiring the servers and
+    # converting their tools is done by subtasks supervised by a single
+    # `TaskGroup`; they hand their tools back through a queue, and then
+    # wait for the shared shutdown event to release their servers.
+    shutdown_event = asyncio.Event()
+    spawn_semaphore = asyncio.Semaphore(_MAX_CONCURRENT_SPAWNS)
+    tools_queue: asyncio.Queue[
+        Tuple[int, List[BaseTool]] | BaseException
+    ] = asyncio.Queue()
+    # Whether the tools are still being collected from the queue
+    initializing = True
+
+    async def init_one(
+        index: int,
+        server_name: str,
+        server_config: Dict[str, Any]
+    ) -> None:
+        """Acquires a server, lists its tools and holds it until cleanup"""
+        entry = _acquire_mcp_server(
             server_name,
             server_config,
-            async_exit_stack,
-            logger
+            spawn_semaphore,
+            logger,
+            timeout
         )
-        stdio_transports.append(stdio_transport)
-
-    # Convert tools from each server to LangChain format
-    langchain_tools: List[BaseTool] = []
-    for (server_name, server_config), stdio_transport in zip(
-        server_configs.items(),
-        stdio_transports,
-        strict=True
-    ):
-        tools = await get_mcp_server_tools(
-            server_name,
-            stdio_transport,
-            async_exit_stack,
-            logger
-        )
-        langchain_tools.extend(tools)
+        try:
+            # Shield the shared future from the cancellation of this caller
+            session = await asyncio.shield(entry.session)
+            tools = await get_mcp_server_tools(
+                server_name,
+                session,
+                logger,
+                lazy,
+                timeout
+            )
+            tools_queue.put_nowait((index, tools))
+            await shutdown_event.wait()
+        finally:
+            await _release_mcp_server(entry)
+
+    async def supervisor() -> None:
+        """Runs all servers; a failure of one cancels all the others"""
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                for index, (server_name, server_config) in enumerate(
+                    server_items
+                ):
+                    task_group.create_task(
+                        init_one(index, server_name, server_config)
+                    )
+        except BaseExceptionGroup as eg:
+            if initializing:
+                # Wake up the initialization below, which raises it
+                tools_queue.put_nowait(eg.exceptions[0])
+                return
+            # Otherwise it was raised on shutdown; let `mcp_cleanup()`
+            # raise it
+            logger.error('Error shutting down MCP servers: %s',
+                         eg.exceptions[0])
+            raise eg.exceptions[0]
+
+    supervisor_task = asyncio.create_task(supervisor())
 
     # Define a cleanup function to properly shut down all servers
     async def mcp_cleanup() -> None:
         """Closes all server connections and cleans up resources"""
-        await async_exit_stack.aclose()
+        shutdown_event.set()
+        await supervisor_task
+
+    # Collect the tools in the config order, regardless of the order
+    # in which the servers become ready
+    per_server_tools: List[List[BaseTool]] = [[] for _ in server_items]
+    try:
+        for _ in range(len(server_items)):
+            item = await tools_queue.get()
+            if isinstance(item, BaseException):
+                raise item
+            index, tools = item
+            per_server_tools[index] = tools
+    except BaseException:
+        # Also stop the servers that are still starting up
+        supervisor_task.cancel()
+        await asyncio.gather(supervisor_task, return_exceptions=True)
+        raise
+    initializing = False
+
+    langchain_tools: List[BaseTool] = list(
+        itertools.chain.from_iterable(per_server_tools)
+    )
 
     # Log summary of initialized tools
-    logger.info(f'MCP servers initialized: {len(langchain_tools)} tool(s) '
-                f'available in total')
-    for tool in langchain_tools:
-        logger.debug(f'- {tool.name}')
+    logger.info('MCP servers initialized: %d tool(s) available in total',
+                len(langchain_tools))
+    if logger.isEnabledFor(logging.DEBUG):
+        for tool in langchain_tools:
+            logger.debug('- %s', tool.name)
 
     return langchain_tools, mcp_cleanup
@@ -1,7 +1,11 @@
+import anyio
+import asyncio
 import pytest
+from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, MagicMock, patch
 from langchain_core.tools import BaseTool
 from langchain_mcp_tools.langchain_mcp_tools import (
+    _server_pool,
     convert_mcp_to_langchain_tools,
 )
 
@@ -9,6 +13,23 @@ from langchain_mcp_tools.langchain_mcp_tools import (
 pytest_plugins = ('pytest_asyncio',)
 
 
+def _make_fake_tool(name, description, input_schema):
+    tool = MagicMock(description=description, inputSchema=input_schema)
+    # NOTE: `name` is consumed by the `MagicMock` constructor itself
+    tool.name = name
+    return tool
+
+
+# Tools listed by every mocked server; built once and shared by all tests
+_FAKE_TOOLS = [
+    _make_fake_tool(
+        "tool1",
+        "Test tool",
+        {"type": "object", "properties": {}}
+    )
+]
+
+
 @pytest.fixture
 def mock_stdio_client():
     with patch('langchain_mcp_tools.langchain_mcp_tools.stdio_client') as mock:
@@ -22,14 +43,8 @@ def mock_client_session():
             as mock:
         session = AsyncMock()
         # Mock the list_tools response
-        session.list_tools.return_value = MagicMock(
-            tools=[
-                MagicMock(
-                    name="tool1",
-                    description="Test tool",
-                    inputSchema={"type": "object", "properties": {}}
-                )
-            ]
+        session.list_tools = AsyncMock(
+            return_value=MagicMock(tools=_FAKE_TOOLS)
         )
         mock.return_value.__aenter__.return_value = session
         yield mock
@@ -158,7 +173,343 @@ async def test_tool_execution_error(mock_stdio_client, mock_client_session):
     tools, cleanup = await convert_mcp_to_langchain_tools(server_configs)
 
     # Test tool execution error
-    with pytest.raises(Exception):
+    with pytest.raises(Exception, match="Error message"):
         await tools[0]._arun(test_param="value")
 
     await cleanup()
+
+
+@pytest.mark.asyncio
+async def test_identical_schemas_share_args_schema(
+    mock_stdio_client,
+    mock_client_session
+):
+    server_configs = {
+        "server1": {"command": "cmd1", "args": []},
+        "server2": {"command": "cmd2", "args": []}
+    }
+
+    tools, cleanup = await convert_mcp_to_langchain_tools(server_configs)
+
+    # Both servers expose the same schema, so the model is compiled once
+    assert tools[0].args_schema is tools[1].args_schema
+
+    await cleanup()
+
+
+@pytest.mark.asyncio
+async def test_tool_execution_text_content(
+    mock_stdio_client,
+    mock_client_session
+):
+    server_configs = {
+        "test_server": {"command": "test", "args": []}
+    }
+
+    # Mock a multi-part text response
+    session = mock_client_session.return_value.__aenter__.return_value
+    session.call_tool.return_value = MagicMock(
+        isError=False,
+        content=[MagicMock(text="Hello, "), MagicMock(text="world")]
+    )
+
+    tools, cleanup = await convert_mcp_to_langchain_tools(server_configs)
+
+    result = await tools[0]._arun(test_param="value")
+    assert result == "Hello, world"
+
+    # Verify tool was called with correct parameters
+    session.call_tool.assert_called_once_with("tool1", {"test_param": "value"})
+
+    await cleanup()
+
+
+@pytest.mark.asyncio
+async def test_tool_execution_image_content(
+    mock_stdio_client,
+    mock_client_session
+):
+    server_configs = {
+        "test_server": {"command": "test", "args": []}
+    }
+
+    # Mock an images-only response
+    session = mock_client_session.return_value.__aenter__.return_value
+    session.call_tool.return_value = MagicMock(
+        isError=False,
+        content=[MagicMock(spec=["data", "mimeType"])]
+    )
+
+    tools, cleanup = await convert_mcp_to_langchain_tools(server_configs)
+
+    result = await tools[0]._arun(test_param="value")
+    assert result.startswith("Result content text parsing error:")
+
+    await cleanup()
+
+
+@pytest.mark.asyncio
+async def test_identical_configs_share_server(
+    mock_stdio_client,
+    mock_client_session
+):
+    server_config = {"command": "cmd", "args": ["--same"]}
+
+    tools1, cleanup1 = await convert_mcp_to_langchain_tools(
+        {"server1": server_config, "server2": dict(server_config)}
+    )
+    tools2, cleanup2 = await convert_mcp_to_langchain_tools(
+        {"server3": server_config}
+    )
+
+    # A single process serves all the identical configs
+    assert mock_stdio_client.call_count == 1
+    assert len(tools1) == 2 and len(tools2) == 1
+
+    await cleanup1()
+    assert _server_pool  # still referenced by the second caller
+    await cleanup2()
+    assert not _server_pool
+
+
+@pytest.mark.asyncio
+async def test_dead_server_is_not_shared(
+    mock_stdio_client,
+    mock_client_session
+):
+    deaths = []
+
+    @asynccontextmanager
+    async def dying_stdio_client(server_params):
+        # Mock a server whose transport fails once its event gets set
+        death = asyncio.Event()
+        deaths.append(death)
+
+        async def transport():
+            await death.wait()
+            raise anyio.BrokenResourceError
+
+        async with anyio.create_task_group() as task_group:
+            task_group.start_soon(transport)
+            yield (AsyncMock(), AsyncMock())
+            task_group.cancel_scope.cancel()
+
+    mock_stdio_client.side_effect = dying_stdio_client
+    server_config = {"command": "cmd", "args": []}
+
+    tools1, cleanup1 = await convert_mcp_to_langchain_tools(
+        {"server1": server_config}
+    )
+    deaths[0].set()
+    async with asyncio.timeout(1.0):
+        while _server_pool:
+            await asyncio.sleep(0)
+
+    # A fresh process replaces the dead one
+    tools2, cleanup2 = await convert_mcp_to_langchain_tools(
+        {"server2": server_config}
+    )
+    assert mock_stdio_client.call_count == 2
+
+    with pytest.raises(ExceptionGroup) as exc_info:
+        await cleanup1()
+    assert exc_info.group_contains(anyio.BrokenResourceError)
+    await cleanup2()
+    assert not _server_pool
+
+
+@pytest.mark.asyncio
+async def test_no_share_config_spawns_own_server(
+    mock_stdio_client,
+    mock_client_session
+):
+    server_config = {"command": "cmd", "args": [], "noShare": True}
+
+    tools, cleanup = await convert_mcp_to_langchain_tools(
+        {"server1": server_config, "server2": server_config}
+    )
+
+    assert mock_stdio_client.call_count == 2
+    assert not _server_pool
+
+    await cleanup()
+
+
+@pytest.mark.asyncio
+async def test_lazy_args_schema(mock_stdio_client, mock_client_session):
+    server_configs = {
+        "test_server": {"command": "test", "args": []}
+    }
+
+    with patch(
+        'langchain_mcp_tools.langchain_mcp_tools._compile_schema'
+    ) as compile_schema:
+        tools, cleanup = await convert_mcp_to_langchain_tools(
+            server_configs,
+            lazy=True
+        )
+        compile_schema.assert_not_called()
+
+        # The schema is compiled on first access only
+        assert tools[0].args_schema is compile_schema.return_value
+        assert tools[0].args_schema is compile_schema.return_value
+        compile_schema.assert_called_once()
+
+    await cleanup()
+
+
+@pytest.mark.asyncio
+async def test_initialize_timeout(mock_stdio_client, mock_client_session):
+    server_configs = {
+        "test_server": {"command": "test", "args": []}
+    }
+
+    # Mock a server that never responds to the initialization
+    session = mock_client_session.return_value.__aenter__.return_value
+    async def never_respond():
+        await asyncio.Event().wait()
+    session.initialize.side_effect = never_respond
+
+    with pytest.raises(TimeoutError, match="test_server"):
+        await convert_mcp_to_langchain_tools(server_configs, timeout=0.01)
+
+    assert not _server_pool
+
+
+@pytest.mark.asyncio
+async def test_no_timeout(mock_stdio_client, mock_client_session):
+    server_configs = {
+        "test_server": {"command": "test", "args": []}
+    }
+
+    # Mock a server that is slow to initialize
+    session = mock_client_session.return_value.__aenter__.return_value
+    async def respond_slowly():
+        await asyncio.sleep(0.05)
+    session.initialize.side_effect = respond_slowly
+
+    tools, cleanup = await convert_mcp_to_langchain_tools(
+        server_configs,
+        timeout=None
+    )
+    assert len(tools) == 1
+    await cleanup()
+
+
+@asynccontextmanager
+async def _fake_stdio_client(server_params):
+    # Mock servers that fail or hang on spawn, or fail on shutdown,
+    # depending on the command
+    if server_params.command == "fail":
+        raise RuntimeError("boom")
+    if server_params.command == "hang":
+        await asyncio.Event().wait()
+    yield (AsyncMock(), AsyncMock())
+    if server_params.command == "fail_on_exit":
+        raise RuntimeError("exit boom")
+
+
+@pytest.mark.asyncio
+async def test_failing_server_stops_hanging_server(
+    mock_stdio_client,
+    mock_client_session
+):
+    mock_stdio_client.side_effect = _fake_stdio_client
+    server_configs = {
+        "hanging": {"command": "hang", "args": []},
+        "failing": {"command": "fail", "args": []}
+    }
+
+    # The error must be raised without waiting for the hanging server
+    with pytest.raises(RuntimeError, match="boom"):
+        await asyncio.wait_for(
+            convert_mcp_to_langchain_tools(server_configs),
+            timeout=1.0
+        )
+
+
+@pytest.mark.asyncio
+async def test_cancellation_stops_hanging_server(
+    mock_stdio_client,
+    mock_client_session
+):
+    mock_stdio_client.side_effect = _fake_stdio_client
+    server_configs = {
+        "hanging": {"command": "hang", "args": []}
+    }
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(
+            convert_mcp_to_langchain_tools(server_configs),
+            timeout=0.1
+        )
+    assert loop.time() - start < 1.0
+
+
+@pytest.mark.asyncio
+async def test_shutdown_error_raised_by_cleanup(
+    mock_stdio_client,
+    mock_client_session
+):
+    mock_stdio_client.side_effect = _fake_stdio_client
+    server_configs = {
+        "test_server": {"command": "fail_on_exit", "args": []}
+    }
+
+    tools, cleanup = await convert_mcp_to_langchain_tools(server_configs)
+    assert len(tools) == 1
+    with pytest.raises(RuntimeError, match="exit boom"):
+        await cleanup()
+
+
+@pytest.mark.asyncio
+async def test_tool_fields_can_be_customized(
+    mock_stdio_client,
+    mock_client_session
+):
+    server_configs = {
+        "test_server": {"command": "test", "args": []}
+    }
+
+    tools, cleanup = await convert_mcp_to_langchain_tools(server_configs)
+
+    # The common LangChain pattern of setting tool options after creation
+    tools[0].handle_tool_error = True
+    assert tools[0].handle_tool_error is True
+
+    await cleanup()
+
+
+@pytest.mark.asyncio
+async def test_lazy_tool_matches_eager_tool(
+    mock_stdio_client,
+    mock_client_session
+):
+    server_configs = {
+        "test_server": {"command": "test", "args": []}
+    }
+
+    eager_tools, eager_cleanup = await convert_mcp_to_langchain_tools(
+        server_configs
+    )
+    lazy_tools, lazy_cleanup = await convert_mcp_to_langchain_tools(
+        server_configs,
+        lazy=True
+    )
+    eager, lazy = eager_tools[0], lazy_tools[0]
+
+    # Copies made before the first access stay lazy
+    lazy_copies = [lazy.model_copy() for _ in range(4)]
+
+    # Dumps don't depend on whether `args_schema` has been accessed
+    assert repr(lazy) == repr(eager)
+    assert lazy_copies[0].model_dump()["args_schema"] is eager.args_schema
+    assert lazy_copies[1].args_schema is eager.args_schema
+    assert dict(lazy_copies[2])["args_schema"] is eager.args_schema
+    assert lazy_copies[3].model_fields_set == eager.model_fields_set
+    assert lazy_copies[3] == lazy_copies[1]
+
+    await eager_cleanup()
+    await lazy_cleanup()